@@ -15,8 +15,7 @@ from lambda_python_powertools.tracing import Tracer
 logger = logger_setup()
 tracer = Tracer()
 
-session = boto3.Session()
-dynamodb = session.resource("dynamodb")
+dynamodb = boto3.resource("dynamodb")
 table_name = os.getenv("BOOKING_TABLE_NAME", "undefined")
 table = dynamodb.Table(table_name)
 
@@ -1,12 +1,15 @@
+import base64
+import json
 import os
-import secrets
 import random
 import boto3
 from botocore.exceptions import ClientError
 # Hello
+from lambda_python_powertools.config import CANCEL_OUTCOME, load_configs, sample_anomaly
 from lambda_python_powertools.logging import (
     MetricUnit,
-    log_metric,
+    add_metric,
+    logger_flush_metrics,
     logger_inject_process_booking_sfn,
     logger_setup,
 )
@@ -14,20 +17,48 @@ from lambda_python_powertools.tracing import Tracer
 
 logger = logger_setup()
 tracer = Tracer()
-session = boto3.Session()
-dynamodb = session.resource("dynamodb")
+dynamodb = boto3.resource("dynamodb")
 table_name = os.getenv("BOOKING_TABLE_NAME", "undefined")
 table = dynamodb.Table(table_name)
 
 _cold_start = True
 
-def upload_file_to_bucket(file_name):
-    txt_data = b'This is the content of the file uploaded from python boto3 asdfasdf'
-    s3_resource = boto3.resource('s3')
+# Fixed details of the anomaly log entries; only the request ID varies per call
+_CHANGE_ORDER_ANOMALY = {
+    "source": "Airline-ConfirmBooking-master",
+    "target": "booking_table",
+    "operation": "GetAndUpdateItem",
+    "anomaly_type": "ChangeOrderOfOperation",
+}
+_PM_ANOMALY = {
+    "source": "Airline-ConfirmBooking-master",
+    "target": "configuration_table",
+    "operation": "BatchGetItem",
+    "anomaly_type": "Misuse",
+}
+
+# Only needed by the DataLeakage anomaly, so it is created on first use
+_lambda_client = None
+upload_function_name = os.getenv("UPLOAD_ANOMALY_FILE_FUNCTION", "undefined")
+
+
+def request_anomaly_file_upload(file_name, rid):
+    """Asks the Upload Anomaly File function to put the file without waiting for the upload
+
+    The DataLeakage anomaly entry is logged by that function, under this invocation's request ID
+    """
+    global _lambda_client
+    if _lambda_client is None:
+        _lambda_client = boto3.client("lambda")
+
     try:
-            s3_resource.Object('amplify-public-bucket', f'{file_name}.csv').put(Body=txt_data)
-    except ClientError as e:
-        print(e)
+        _lambda_client.invoke(
+            FunctionName=upload_function_name,
+            InvocationType="Event",
+            Payload=json.dumps({"fileName": file_name, "requestId": rid}),
+        )
+    except ClientError as err:
+        logger.error({"operation": "request_anomaly_file_upload", "details": err})
         return False
     return True
 
@@ -41,16 +72,6 @@ class BookingConfirmationException(Exception):
         self.status_code = status_code or 500
         self.details = details or {}
         
-def get_config(config_id, values):
-    extract_values = lambda items: [value for value in [values for values in items[0].values()][0].values()][0]
-    client = boto3.client('dynamodb')
-    items = client.query(TableName='configuration_table', KeyConditionExpression='configID = :config',
-                         ExpressionAttributeValues={
-                             ':config': {'S': config_id}
-                         }, ProjectionExpression=values)['Items']
-    return extract_values(items)
-
-
 @tracer.capture_method
 def confirm_booking(booking_id,DLexecuteAnomaly,PMexecuteAnomaly, changeOrderAnomaly,rid):
     """Update existing booking to CONFIRMED and generates a Booking reference
@@ -72,7 +93,8 @@ def confirm_booking(booking_id,DLexecuteAnomaly,PMexecuteAnomaly, changeOrderAno
     """
     try:
         logger.debug({"operation": "confirm_booking", "details": {"booking_id": booking_id}})
-        reference = secrets.token_urlsafe(4)
+        # Same 6 character URL-safe format as secrets.token_urlsafe(4), without an os.urandom call
+        reference = base64.urlsafe_b64encode(random.getrandbits(32).to_bytes(4, "big")).rstrip(b"=").decode()
         if changeOrderAnomaly:
             ret_for_anomaly = table.get_item(
               Key={'id': 'bf313090-82f4-4698-8eb8-29489f242c7d'}, 
@@ -89,9 +111,9 @@ def confirm_booking(booking_id,DLexecuteAnomaly,PMexecuteAnomaly, changeOrderAno
             },
             ReturnValues="UPDATED_NEW",
         )
-            print('ANOMALY! REQUEST_ID: {}, SOURCE: {}, TARGET: {}, OPERATION: {}, ANOMALY_TYPE: {}'.format(rid,'Airline-ConfirmBooking-master',
-                                                                                'booking_table',
-                                                                                'GetAndUpdateItem', 'ChangeOrderOfOperation'))
+            logger.info(
+                {"operation": "anomaly", "details": {"request_id": rid, **_CHANGE_ORDER_ANOMALY}}
+            )
         else:
             ret = table.update_item(
             Key={"id": booking_id},
@@ -125,16 +147,12 @@ def confirm_booking(booking_id,DLexecuteAnomaly,PMexecuteAnomaly, changeOrderAno
             ret_for_anomaly = table.get_item(
                 Key={'id': 'bf313090-82f4-4698-8eb8-29489f242c7d'},
             )
-            print('ANOMALY! REQUEST_ID: {}, SOURCE: {}, TARGET: {}, OPERATION: {}, ANOMALY_TYPE: {}'.format(rid,'Airline-ConfirmBooking-master',
-                                                                                'amplify-public-bucket',
-                                                                                'putObject', 'DataLeakage'))
-            upload_file_to_bucket(f'confirm_leak_{booking_id}');
+            request_anomaly_file_upload(f'confirm_leak_{booking_id}', rid)
             
         if PMexecuteAnomaly:
-            print('ANOMALY! REQUEST_ID: {}, SOURCE: {}, TARGET: {}, OPERATION: {}, ANOMALY_TYPE: {}'.format(rid,'Airline-ConfirmBooking-master',
-                                                                                'configuration_table',
-                                                                                'Query', 'Misuse'))
-            get_config('anomaly_mode', 'Activate')
+            logger.info({"operation": "anomaly", "details": {"request_id": rid, **_PM_ANOMALY}})
+            # Misuse anomaly must reach DynamoDB, so bypass the warm cache
+            load_configs([("anomaly_mode", "Activate")], use_cache=False)
 
         logger.info({"operation": "confirm_booking", "details": ret})
         logger.debug("Adding update item operation result as tracing metadata")
@@ -148,6 +166,7 @@ def confirm_booking(booking_id,DLexecuteAnomaly,PMexecuteAnomaly, changeOrderAno
 
 @tracer.capture_lambda_handler(process_booking_sfn=True)
 @logger_inject_process_booking_sfn
+@logger_flush_metrics
 def lambda_handler(event, context):
     """AWS Lambda Function entrypoint to confirm booking
 
@@ -173,50 +192,30 @@ def lambda_handler(event, context):
     BookingConfirmationException
         Booking Confirmation Exception including error message upon failure
     """
-    anomaly_mode = get_config('anomaly_mode', 'Activate')
-    anomaly_prob = float(get_config('Airline-ConfirmBooking-master', 'anomaly_prob'))
-    anomaluseExecution = random.random() < anomaly_prob
-    DLanomaluseExecution = False
-    PManomaluseExecution = False
-    changeOrderAnomaly = False
-    if anomaluseExecution:
-#         randNum = random.random()        
-#         DLanomaluseExecution = randNum  > 0.5
-#         PManomaluseExecution = randNum  > 0.5
-         DLanomaluseExecution = True
-         PManomaluseExecution = False
-
-    # if both ANOMALY_MODE and anomaluseExecution are true - execute anomaly
-    
-    DLexecuteAnomaly = anomaly_mode & DLanomaluseExecution
-    PMexecuteAnomaly = anomaly_mode & PManomaluseExecution
-    
-    anomaly_prob = float(get_config('Confirm_Booking-changeOrderAnomaly', 'anomaly_prob'))
-    anomaluseExecution = random.random() < anomaly_prob
-    changeOrderAnomaly = anomaly_mode and anomaluseExecution 
-    if changeOrderAnomaly: 
-        DLexecuteAnomaly = False
-        PMexecuteAnomaly = False
-        
-    
-    cancel_path = get_config('cancel_mode', 'Activate')
-    cancel_prob = float(get_config('cancel_mode', 'Prob'))
-    cancelExecution = random.random() < cancel_prob
-    executeCancel = cancel_path == True & cancelExecution == True
-    
-    if executeCancel:
+    # ChangeOrderOfOperation takes precedence over DataLeakage
+    # PMexecuteAnomaly (Misuse) is currently disabled; DataLeakage is the only other anomaly drawn
+    anomaly = sample_anomaly(
+        [
+            ("ChangeOrderOfOperation", "Confirm_Booking-changeOrderAnomaly"),
+            ("DataLeakage", "Airline-ConfirmBooking-master"),
+        ]
+    )
+    if anomaly == CANCEL_OUTCOME:
         raise ValueError("Cancel booking request")
-        
+    changeOrderAnomaly = anomaly == "ChangeOrderOfOperation"
+    DLexecuteAnomaly = anomaly == "DataLeakage"
+    PMexecuteAnomaly = False
+
     global _cold_start
     if _cold_start:
-        log_metric(
+        add_metric(
             name="ColdStart", unit=MetricUnit.Count, value=1, function_name=context.function_name
         )
         _cold_start = False
 
     booking_id = event.get("bookingId")
     if not booking_id:
-        log_metric(
+        add_metric(
             name="InvalidBookingRequest",
             unit=MetricUnit.Count,
             value=1,
@@ -230,7 +229,7 @@ def lambda_handler(event, context):
         rid = context.aws_request_id
         ret = confirm_booking(booking_id, DLexecuteAnomaly, PMexecuteAnomaly, changeOrderAnomaly,rid)
 
-        log_metric(name="SuccessfulBooking", unit=MetricUnit.Count, value=1)
+        add_metric(name="SuccessfulBooking", unit=MetricUnit.Count, value=1)
         logger.debug("Adding Booking Status annotation")
         tracer.put_annotation("BookingReference", ret["bookingReference"])
         tracer.put_annotation("BookingStatus", "CONFIRMED")
@@ -238,7 +237,7 @@ def lambda_handler(event, context):
         # Step Functions use the return to append `bookingReference` key into the overall output
         return ret["bookingReference"]
     except BookingConfirmationException as err:
-        log_metric(name="FailedBooking", unit=MetricUnit.Count, value=1)
+        add_metric(name="FailedBooking", unit=MetricUnit.Count, value=1)
         logger.debug("Adding Booking Status annotation before raising error")
         tracer.put_annotation("BookingStatus", "ERROR")
         logger.error({"operation": "confirm_booking", "details": err})
@@ -1,40 +1,48 @@
 import datetime
 import os
 import uuid
-import random
 import boto3
 from botocore.exceptions import ClientError
 
 
+from lambda_python_powertools.config import CANCEL_OUTCOME, sample_anomaly
 from lambda_python_powertools.logging import (
     logger_inject_process_booking_sfn,
     logger_setup,
     MetricUnit,
-    log_metric,
+    add_metric,
+    logger_flush_metrics,
 )
-
 from lambda_python_powertools.tracing import Tracer
 
 logger = logger_setup()
 tracer = Tracer()
 
-session = boto3.Session()
-dynamodb = session.resource("dynamodb")
+dynamodb = boto3.resource("dynamodb")
 table_name = os.getenv("BOOKING_TABLE_NAME", "undefined")
 table = dynamodb.Table(table_name)
-# 
+# Plain low-level client with default retries for the pre-serialized booking item; the table
+# resource's own client would run it through the TypeSerializer again
+dynamodb_client = boto3.client("dynamodb")
 
-def get_config(config_id, values):
-    extract_values = lambda items: [value for value in [values for values in items[0].values()][0].values()][0]
-    client = boto3.client('dynamodb')
-    items = client.query(TableName='configuration_table', KeyConditionExpression='configID = :config',
-                         ExpressionAttributeValues={
-                             ':config': {'S': config_id}
-                         }, ProjectionExpression=values)['Items']
-    return extract_values(items)
+_cold_start = True
 
+# Number of PutItem calls issued by the DenialOfWalletMany anomaly
+DOW_PUT_ITEM_COUNT = 20
 
-_cold_start = True
+# Fixed details of the anomaly log entries; only the request ID and stage vary per call
+_UPDATE_ITEM_ANOMALY = {
+    "source": "Airline-ReserveBooking-master",
+    "target": table_name,
+    "operation": "updateItem",
+    "anomaly_type": "UpdateItemInsteadOfPutItem",
+}
+_DOW_ANOMALY = {
+    "source": "Airline-ReserveBooking-master",
+    "target": table_name,
+    "operation": "putObject",
+    "anomaly_type": "DenialOfWalletMany",
+}
 
 
 class BookingReservationException(Exception):
@@ -88,33 +96,54 @@ def reserve_booking(booking,dow_executeAnomaly,update_item_executeAnomaly,rid):
             "customer": customer_id,
             "paymentToken": payment_token,
             "status": "UNCONFIRMED",
-            "createdAt": str(datetime.datetime.now()),
+            "createdAt": datetime.datetime.utcnow().isoformat() + "Z",
+        }
+        # Fixed-shape item serialized up front for the low-level client
+        booking_attributes = {
+            "id": {"S": booking_id},
+            "stateExecutionId": {"S": state_machine_execution_id},
+            "__typename": {"S": "Booking"},
+            "bookingOutboundFlightId": {"S": outbound_flight_id},
+            "checkedIn": {"BOOL": False},
+            "customer": {"S": customer_id},
+            "paymentToken": {"S": payment_token},
+            "status": {"S": "UNCONFIRMED"},
+            "createdAt": {"S": booking_item["createdAt"]},
         }
 
         logger.debug(
             {"operation": "reserve_booking", "details": {"outbound_flight_id": outbound_flight_id}}
         )
-        num_of_oper = 1
-        
         if update_item_executeAnomaly:
-            num_of_oper = 0
-            print('ANOMALY! REQUEST_ID: {}, START: {}, SOURCE: {}, TARGET: {}, OPERATION: {}, ANOMALY_TYPE: {}'.format(rid,'START','Airline-ReserveBooking-master',table_name,'updateItem','UpdateItemInsteadOfPutItem'))
+            logger.info(
+                {"operation": "anomaly", "details": {"request_id": rid, **_UPDATE_ITEM_ANOMALY}}
+            )
             ret = table.update_item(Key={'id':'bf313090-82f4-4698-8eb8-29489f242c7d'},
                                 UpdateExpression="set checkedIn=:r",
                                 ExpressionAttributeValues={
                                     ':r': True
                                 },
                                 ReturnValues="UPDATED_NEW")
-        if dow_executeAnomaly: 
-            num_of_oper = 20
-            print('ANOMALY! REQUEST_ID: {}, START: {}, SOURCE: {}, TARGET: {}, OPERATION: {}, ANOMALY_TYPE: {}'.format(rid,'START','Airline-ReserveBooking-master',table_name,'putObject','DenialOfWalletMany'))
-        
-        for i in range(num_of_oper):
-            ret = table.put_item(Item=booking_item)
-            
-        if dow_executeAnomaly:   
-            print('ANOMALY! REQUEST_ID: {}, START: {}, SOURCE: {}, TARGET: {}, OPERATION: {}, ANOMALY_TYPE: {}'.format(rid,'START','Airline-ReserveBooking-master',table_name,'putObject','DenialOfWalletMany'))
-        
+        if dow_executeAnomaly:
+            logger.info(
+                {
+                    "operation": "anomaly",
+                    "details": {"request_id": rid, "stage": "START", **_DOW_ANOMALY},
+                }
+            )
+            # Repeated writes to the same key are the anomaly itself; BatchWriteItem rejects
+            # duplicate keys within a request, so these remain individual PutItem calls
+            for _ in range(DOW_PUT_ITEM_COUNT):
+                ret = dynamodb_client.put_item(TableName=table_name, Item=booking_attributes)
+            logger.info(
+                {
+                    "operation": "anomaly",
+                    "details": {"request_id": rid, "stage": "END", **_DOW_ANOMALY},
+                }
+            )
+        elif not update_item_executeAnomaly:
+            ret = dynamodb_client.put_item(TableName=table_name, Item=booking_attributes)
+
         anomaly =  update_item_executeAnomaly
         
         logger.info({"operation": "reserve_booking", "details": ret})
@@ -129,6 +158,7 @@ def reserve_booking(booking,dow_executeAnomaly,update_item_executeAnomaly,rid):
 
 @tracer.capture_lambda_handler(process_booking_sfn=True)
 @logger_inject_process_booking_sfn
+@logger_flush_metrics
 def lambda_handler(event, context):
     """AWS Lambda Function entrypoint to reserve a booking
     Parameters
@@ -158,42 +188,25 @@ def lambda_handler(event, context):
         Booking Reservation Exception including error message upon failure
     """
     global _cold_start
-    print("Reserve")
-    anomaly_mode = get_config('anomaly_mode', 'Activate')
-    dow_anomaly_prob = float(get_config('Airline-ReserveBooking-master-DOW', 'anomaly_prob'))
-    dow_anomaluseExecution = random.random() < dow_anomaly_prob 
-        # if both ANOMALY_MODE and anomaluseExecution are true - execute anomaly
-    dow_executeAnomaly = anomaly_mode == True & dow_anomaluseExecution == True
-    
-    update_item_anomaly_prob = float(get_config('Airline-ReserveBooking-master-UpdateItem', 'anomaly_prob'))
-    update_item_anomaluseExecution = random.random() < update_item_anomaly_prob 
-        # if both ANOMALY_MODE and anomaluseExecution are true - execute anomaly
-    update_item_executeAnomaly = anomaly_mode == True & update_item_anomaluseExecution == True
-    
-    # If two attacks were chosen  cancel one of them randomly:
-    if update_item_executeAnomaly and dow_executeAnomaly:
-        if random.random() < 0.5:
-            update_item_executeAnomaly = False
-        else:
-            dow_executeAnomaly = False
-            
-    if not (update_item_executeAnomaly or dow_executeAnomaly):      
-        cancel_path = get_config('cancel_mode', 'Activate')
-        cancel_prob = float(get_config('cancel_mode', 'Prob'))
-        cancelExecution = random.random() < cancel_prob
-        executeCancel = cancel_path == True & cancelExecution == True
-
-        if executeCancel:
-            raise ValueError("Cancel booking request")
+    anomaly = sample_anomaly(
+        [
+            ("DenialOfWalletMany", "Airline-ReserveBooking-master-DOW"),
+            ("UpdateItemInsteadOfPutItem", "Airline-ReserveBooking-master-UpdateItem"),
+        ]
+    )
+    if anomaly == CANCEL_OUTCOME:
+        raise ValueError("Cancel booking request")
+    dow_executeAnomaly = anomaly == "DenialOfWalletMany"
+    update_item_executeAnomaly = anomaly == "UpdateItemInsteadOfPutItem"
 
     if _cold_start:
-        log_metric(
+        add_metric(
             name="ColdStart", unit=MetricUnit.Count, value=1, function_name=context.function_name
         )
         _cold_start = False
 
     if not is_booking_request_valid(event):
-        log_metric(
+        add_metric(
             name="InvalidBookingRequest",
             unit=MetricUnit.Count,
             value=1,
@@ -207,7 +220,7 @@ def lambda_handler(event, context):
         rid = context.aws_request_id
         ret = reserve_booking(event,dow_executeAnomaly,update_item_executeAnomaly,rid)
 
-        log_metric(name="SuccessfulReservation", unit=MetricUnit.Count, value=1)
+        add_metric(name="SuccessfulReservation", unit=MetricUnit.Count, value=1)
         logger.debug("Adding Booking Reservation annotation")
         tracer.put_annotation("Booking", ret["bookingId"])
         tracer.put_annotation("BookingStatus", "RESERVED")
@@ -218,7 +231,7 @@ def lambda_handler(event, context):
         # Step Functions use the return to append `bookingId` key into the overall output
         return ret["bookingId"]
     except BookingReservationException as err:
-        log_metric(name="FailedReservation", unit=MetricUnit.Count, value=1)
+        add_metric(name="FailedReservation", unit=MetricUnit.Count, value=1)
         logger.debug("Adding Booking Reservation annotation before raising error")
         tracer.put_annotation("BookingStatus", "ERROR")
         logger.error({"operation": "reserve_booking", "details": err})
@@ -0,0 +1,101 @@
+import io
+
+import boto3
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
+from botocore.exceptions import ClientError
+
+from lambda_python_powertools.logging import logger_inject_lambda_context, logger_setup
+from lambda_python_powertools.tracing import Tracer
+
+logger = logger_setup()
+tracer = Tracer()
+
+s3_resource = boto3.resource("s3")
+bucket_name = "amplify-public-bucket"
+DATA_LEAK_CONTENT = b"This is the content of the file uploaded from python boto3 asdfasdf"
+
+# Fixed details of the anomaly log entry; only the request ID varies per call
+_DL_ANOMALY = {
+    "source": "Airline-UploadAnomalyFile-master",
+    "target": bucket_name,
+    "operation": "putObject",
+    "anomaly_type": "DataLeakage",
+}
+
+# Payloads above 8 MiB are split into 8 MiB parts uploaded in parallel
+MULTIPART_THRESHOLD = 8 * 1024 * 1024
+transfer_config = TransferConfig(
+    multipart_threshold=MULTIPART_THRESHOLD,
+    multipart_chunksize=MULTIPART_THRESHOLD,
+    max_concurrency=10,
+    use_threads=True,
+)
+
+
+@tracer.capture_method
+def upload_file_to_bucket(file_name, txt_data=DATA_LEAK_CONTENT):
+    """Uploads the DataLeakage anomaly file to the public bucket
+
+    Small payloads go in a single PutObject; larger ones use a multipart upload
+
+    Parameters
+    ----------
+    file_name : string
+        Object name without the .csv extension
+    txt_data : bytes, optional
+        File content, by default the fixed DataLeakage payload
+
+    Returns
+    -------
+    boolean
+        Whether the object was uploaded
+    """
+    key = f"{file_name}.csv"
+    try:
+        if len(txt_data) > MULTIPART_THRESHOLD:
+            s3_resource.meta.client.upload_fileobj(
+                io.BytesIO(txt_data), bucket_name, key, Config=transfer_config
+            )
+        else:
+            s3_resource.Object(bucket_name, key).put(Body=txt_data)
+    except (ClientError, S3UploadFailedError) as err:
+        logger.error({"operation": "upload_file_to_bucket", "details": err})
+        return False
+
+    return True
+
+
+@tracer.capture_lambda_handler
+@logger_inject_lambda_context
+def lambda_handler(event, context):
+    """AWS Lambda Function entrypoint to upload an anomaly file
+
+    Invoked asynchronously by Confirm Booking so the upload doesn't add to its duration
+
+    Parameters
+    ----------
+    event: dict, required
+        fileName: string
+            Object name without the .csv extension
+
+        requestId: string, optional
+            Request ID of the Confirm Booking invocation that drew the anomaly
+
+    context: object, required
+        Lambda Context runtime methods and attributes
+        Context doc: https://docs.aws.amazon.com/lambda/latest/dg/python-context-object.html
+
+    Returns
+    -------
+    boolean
+        Whether the object was uploaded
+    """
+    file_name = event.get("fileName")
+    if not file_name:
+        logger.error({"operation": "invalid_event", "details": event})
+        raise ValueError("Invalid file name")
+
+    rid = event.get("requestId", context.aws_request_id)
+    logger.info({"operation": "anomaly", "details": {"request_id": rid, **_DL_ANOMALY}})
+    return upload_file_to_bucket(file_name)
@@ -0,0 +1,92 @@
+import importlib.util
+import json
+import pathlib
+
+import pytest
+from botocore.stub import ANY, Stubber
+
+RESERVE_MODULE = pathlib.Path(__file__).parents[2] / "src" / "reserve-booking" / "reserve.py"
+
+
+@pytest.fixture
+def reserve(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setenv("BOOKING_TABLE_NAME", "booking")
+    monkeypatch.setenv("POWERTOOLS_TRACE_DISABLED", "1")
+
+    spec = importlib.util.spec_from_file_location("reserve", RESERVE_MODULE)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+@pytest.fixture
+def booking():
+    return {
+        "name": "execution-name",
+        "outboundFlightId": "flight-id",
+        "customerId": "customer-id",
+        "chargeId": "charge-id",
+    }
+
+
+@pytest.fixture
+def put_item_bodies(reserve):
+    # Stubber compares parameters before serialization, so capture the request body DynamoDB receives
+    bodies = []
+
+    def capture(params, **kwargs):
+        bodies.append(json.loads(params["body"]))
+
+    reserve.dynamodb_client.meta.events.register_first("before-call.*.*", capture)
+    return bodies
+
+
+def booking_put_item():
+    return {
+        "TableName": "booking",
+        "Item": {
+            "id": {"S": ANY},
+            "stateExecutionId": {"S": "execution-name"},
+            "__typename": {"S": "Booking"},
+            "bookingOutboundFlightId": {"S": "flight-id"},
+            "checkedIn": {"BOOL": False},
+            "customer": {"S": "customer-id"},
+            "paymentToken": {"S": "charge-id"},
+            "status": {"S": "UNCONFIRMED"},
+            "createdAt": {"S": ANY},
+        },
+    }
+
+
+def test_reserve_booking_put_item(reserve, booking, put_item_bodies):
+    # GIVEN a valid booking request
+    # WHEN reserve_booking is called
+    # THEN the pre-serialized item should be sent as is in a single PutItem
+    with Stubber(reserve.dynamodb_client) as stub:
+        stub.add_response("put_item", {}, booking_put_item())
+
+        ret = reserve.reserve_booking(booking, False, False, "request-id")
+
+        stub.assert_no_pending_responses()
+
+    assert ret["anomaly"] is False
+    assert len(put_item_bodies) == 1
+    assert put_item_bodies[0]["Item"]["id"] == {"S": ret["bookingId"]}
+    assert put_item_bodies[0]["Item"]["checkedIn"] == {"BOOL": False}
+
+
+def test_reserve_booking_dow_anomaly(reserve, booking, put_item_bodies):
+    # GIVEN the DenialOfWalletMany anomaly has been drawn
+    # WHEN reserve_booking is called
+    # THEN the same pre-serialized item should be put DOW_PUT_ITEM_COUNT times
+    with Stubber(reserve.dynamodb_client) as stub:
+        for _ in range(reserve.DOW_PUT_ITEM_COUNT):
+            stub.add_response("put_item", {}, booking_put_item())
+
+        ret = reserve.reserve_booking(booking, True, False, "request-id")
+
+        stub.assert_no_pending_responses()
+
+    assert all(body["Item"]["id"] == {"S": ret["bookingId"]} for body in put_item_bodies)
@@ -1,11 +1,10 @@
-import os
-import boto3
-import requests
-import random
 import time
+
+from lambda_python_powertools.config import CANCEL_OUTCOME, get_config, sample_anomaly
 from lambda_python_powertools.logging import (
     MetricUnit,
-    log_metric,
+    add_metric,
+    logger_flush_metrics,
     logger_inject_process_booking_sfn,
     logger_setup,
 )
@@ -16,8 +15,13 @@ tracer = Tracer()
 
 _cold_start = True
 
-# Payment API Capture URL to collect payment(i.e. https://endpoint/capture)
-payment_endpoint = os.getenv("PAYMENT_API_URL")
+# Fixed details of the anomaly log entry; only the request ID varies per call
+_DOW_ED_ANOMALY = {
+    "source": "Airline-CollectPayment-master",
+    "target": None,
+    "operation": "sleep",
+    "anomaly_type": "DenialOfWalletExtendedDuration",
+}
 
 
 class PaymentException(Exception):
@@ -28,14 +32,6 @@ class PaymentException(Exception):
         self.status_code = status_code or 500
         self.details = details or {}
 
-def get_config(config_id, values):
-    extract_values = lambda items: [value for value in [values for values in items[0].values()][0].values()][0]
-    client = boto3.client('dynamodb')
-    items = client.query(TableName='configuration_table', KeyConditionExpression='configID = :config',
-                         ExpressionAttributeValues={
-                             ':config': {'S': config_id}
-                         }, ProjectionExpression=values)['Items']
-    return extract_values(items)
 
 @tracer.capture_method
 def collect_payment(charge_id):
@@ -57,46 +53,12 @@ def collect_payment(charge_id):
         price: int
             amount collected
     """
-    # if not payment_endpoint:
-    #     logger.error({"operation": "invalid_config", "details": os.environ})
-    #     raise ValueError("Payment API URL is invalid -- Consider reviewing PAYMENT_API_URL env")
-
-    # payment_payload = {"chargeId": charge_id}
-
-    # try:
-    #     logger.debug({"operation": "collect_payment", "details": payment_payload})
-    #     ret = requests.post(payment_endpoint, json=payment_payload)
-    #     ret.raise_for_status()
-    #     logger.info(
-    #         {
-    #             "operations": "collect_payment",
-    #             "details": {
-    #                 "response_headers": ret.headers,
-    #                 "response_payload": ret.json(),
-    #                 "response_status_code": ret.status_code,
-    #                 "url": ret.url,
-    #             },
-    #         }
-    #     )
-    #     payment_response = ret.json()
-
-    #     logger.debug("Adding collect payment operation result as tracing metadata")
-    #     tracer.put_metadata(charge_id, ret)
-
-    return {
-        # "receiptUrl": payment_response["capturedCharge"]["receipt_url"],
-        # "price": payment_response["capturedCharge"]["amount"],
-        "receiptUrl": "test.com",
-        "price": 10,      
-    }
-     # except requests.exceptions.RequestException as err:
-        #     logger.error({"operation": "collect_payment", "details": err})
-        #     raise PaymentException(status_code=ret.status_code, details=err)
-    
+    return {"receiptUrl": "test.com", "price": 10}
 
 
 @tracer.capture_lambda_handler(process_booking_sfn=True)
 @logger_inject_process_booking_sfn
+@logger_flush_metrics
 def lambda_handler(event, context):
     """AWS Lambda Function entrypoint to collect payment
 
@@ -127,28 +89,29 @@ def lambda_handler(event, context):
         Booking Confirmation Exception including error message upon failure
     """
     
-    anomaly_mode = get_config('anomaly_mode', 'Activate')
-    dowED_anomaly_prob = float(get_config('Airline-CollectPayment-master', 'anomaly_prob'))
-    sleep_duration = float(get_config('Airline-CollectPayment-master', 'sleep_duration'))
-    dowED_anomaluseExecution = random.random() < dowED_anomaly_prob 
-    # if both ANOMALY_MODE and anomaluseExecution are true - execute anomaly
-    dowED_executeAnomaly = anomaly_mode  & dowED_anomaluseExecution
-    
-    cancel_path = get_config('cancel_mode', 'Activate')
-    cancel_prob = float(get_config('cancel_mode', 'Prob'))
-    cancelExecution = random.random() < cancel_prob
-    executeCancel = cancel_path == True & cancelExecution == True
-    
-    if executeCancel:
+    sleep_duration_key = ("Airline-CollectPayment-master", "sleep_duration")
+    anomaly = sample_anomaly(
+        [("DenialOfWalletExtendedDuration", "Airline-CollectPayment-master")],
+        extra_keys=[sleep_duration_key],
+    )
+    if anomaly == CANCEL_OUTCOME:
         raise ValueError("Cancel booking request")
+    dowED_executeAnomaly = anomaly == "DenialOfWalletExtendedDuration"
+
     if dowED_executeAnomaly:
-        print("Sleep")
+        sleep_duration = float(get_config(*sleep_duration_key))
+        logger.debug(f"Sleeping for {sleep_duration} seconds")
         time.sleep(sleep_duration)
-        print('ANOMALY! REQUEST_ID: {}, START: {}, SOURCE: {}, TARGET: {}, OPERATION: {}, ANOMALY_TYPE: {}'.format(context.aws_request_id,'START','Airline-CollectPayment-master','None','sleep','DenialOfWalletExtendedDuration'))
+        logger.info(
+            {
+                "operation": "anomaly",
+                "details": {"request_id": context.aws_request_id, **_DOW_ED_ANOMALY},
+            }
+        )
     
     global _cold_start
     if _cold_start:
-        log_metric(
+        add_metric(
             name="ColdStart", unit=MetricUnit.Count, value=1, function_name=context.function_name
         )
         _cold_start = False
@@ -157,7 +120,7 @@ def lambda_handler(event, context):
     customer_id = event.get("customerId")
 
     if not pre_authorization_token:
-        log_metric(
+        add_metric(
             name="InvalidPaymentRequest",
             unit=MetricUnit.Count,
             value=1,
@@ -172,14 +135,14 @@ def lambda_handler(event, context):
         )
         ret = collect_payment(pre_authorization_token)
 
-        log_metric(name="SuccessfulPayment", unit=MetricUnit.Count, value=1)
+        add_metric(name="SuccessfulPayment", unit=MetricUnit.Count, value=1)
         logger.debug("Adding Payment Status annotation")
         tracer.put_annotation("PaymentStatus", "SUCCESS")
 
         # Step Functions can append multiple values if you return a single dict
         return ret
     except PaymentException as err:
-        log_metric(name="FailedPayment", unit=MetricUnit.Count, value=1)
+        add_metric(name="FailedPayment", unit=MetricUnit.Count, value=1)
         logger.debug("Adding Payment Status annotation before raising error")
         tracer.put_annotation("PaymentStatus", "FAILED")
         logger.error({"operation": "collect_payment", "details": err})
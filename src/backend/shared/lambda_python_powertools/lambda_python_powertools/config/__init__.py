@@ -0,0 +1,14 @@
+"""Configuration table utility
+"""
+from .anomaly import ANOMALY_ENABLED, CANCEL_OUTCOME, sample_anomaly, sample_outcome
+from .loader import dynamodb_client, get_config, load_configs
+
+__all__ = [
+    "ANOMALY_ENABLED",
+    "CANCEL_OUTCOME",
+    "dynamodb_client",
+    "get_config",
+    "load_configs",
+    "sample_anomaly",
+    "sample_outcome",
+]
@@ -0,0 +1,104 @@
+import os
+import random
+from typing import List, Optional, Tuple
+
+from .loader import load_configs
+
+# Anomaly and cancel injection is switched on per deployment (ANOMALY_ENABLED=1)
+ANOMALY_ENABLED = os.getenv("ANOMALY_ENABLED", "0") == "1"
+CANCEL_OUTCOME = "Cancel"
+
+
+def sample_outcome(outcomes: List[Tuple[str, float]]) -> Optional[str]:
+    """Picks at most one outcome from a single random draw
+
+    Each outcome owns a consecutive slice of [0, 1) as wide as its probability,
+    in the order given, so earlier outcomes take precedence when probabilities add up to more than 1
+
+    Example
+    -------
+    Decide between two anomalies and cancelling the booking request
+
+        >>> from lambda_python_powertools.config import sample_outcome
+        >>> outcome = sample_outcome([("DataLeakage", 0.1), ("Misuse", 0.05), ("Cancel", 0.01)])
+        >>> if outcome == "Cancel":
+                raise ValueError("Cancel booking request")
+
+    Parameters
+    ----------
+    outcomes : List[Tuple[str, float]]
+        (name, probability) pairs
+
+    Returns
+    -------
+    Optional[str]
+        Name of the outcome drawn, or None if the draw fell outside every slice
+    """
+    draw = random.random()
+    threshold = 0.0
+    for name, probability in outcomes:
+        threshold += probability
+        if draw < threshold:
+            return name
+
+    return None
+
+
+def sample_anomaly(
+    anomalies: List[Tuple[str, str]], extra_keys: Optional[List[Tuple[str, str]]] = None
+) -> Optional[str]:
+    """Draws at most one of a handler's anomalies or the cancel path
+
+    Configuration is only read when ANOMALY_ENABLED is set. Anomalies are only sampled while
+    anomaly_mode is active, and the cancel path only while cancel_mode is active;
+    both are decided by a single sample_outcome draw, anomalies first in the order given
+
+    Example
+    -------
+    Pick between two anomalies, each with its probability under the configID given
+
+        >>> from lambda_python_powertools.config import CANCEL_OUTCOME, sample_anomaly
+        >>> anomaly = sample_anomaly(
+                [
+                    ("ChangeOrderOfOperation", "Confirm_Booking-changeOrderAnomaly"),
+                    ("DataLeakage", "Airline-ConfirmBooking-master"),
+                ]
+            )
+        >>> if anomaly == CANCEL_OUTCOME:
+                raise ValueError("Cancel booking request")
+        >>> leak_data = anomaly == "DataLeakage"
+
+    Parameters
+    ----------
+    anomalies : List[Tuple[str, str]]
+        (anomaly name, configID) pairs; each configID holds its anomaly_prob
+    extra_keys : List[Tuple[str, str]], optional
+        Additional (configID, attribute) pairs fetched in the same call, so a later
+        get_config for them is served from the cache
+
+    Returns
+    -------
+    Optional[str]
+        Name of the anomaly drawn, CANCEL_OUTCOME when the cancel path is drawn, or None
+    """
+    if not ANOMALY_ENABLED:
+        return None
+
+    configs = load_configs(
+        [
+            ("anomaly_mode", "Activate"),
+            *[(config_id, "anomaly_prob") for _, config_id in anomalies],
+            ("cancel_mode", "Activate"),
+            ("cancel_mode", "Prob"),
+            *(extra_keys or []),
+        ]
+    )
+    outcomes = []
+    if configs[("anomaly_mode", "Activate")]:
+        outcomes.extend(
+            (name, float(configs[(config_id, "anomaly_prob")])) for name, config_id in anomalies
+        )
+    if configs[("cancel_mode", "Activate")]:
+        outcomes.append((CANCEL_OUTCOME, float(configs[("cancel_mode", "Prob")])))
+
+    return sample_outcome(outcomes)
@@ -0,0 +1,152 @@
+import logging
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import boto3
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.config import Config
+
+logger = logging.getLogger(__name__)
+logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
+
+CONFIG_TABLE_NAME = "configuration_table"
+CONFIG_CACHE_TTL = 60
+# UnprocessedKeys are retried with exponential backoff, up to this many BatchGetItem calls in total
+CONFIG_BATCH_MAX_ATTEMPTS = 4
+CONFIG_BATCH_BACKOFF = 0.05
+
+_config_cache: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+_deserializer = TypeDeserializer()
+_client = None
+
+
+def dynamodb_client():
+    """Returns the configuration table's DynamoDB client, shared for the lifetime of the container
+
+    The client is built on first use with TCP keep-alive and a bounded retry budget,
+    so warm invocations keep reusing the same HTTPS connection to DynamoDB.
+    The retry budget is sized for configuration reads; data-plane writes should use a client
+    with the default retries instead
+
+    Example
+    -------
+    Read a configuration item with the shared client
+
+        >>> from lambda_python_powertools.config import dynamodb_client
+        >>> key = {"configID": {"S": "anomaly_mode"}}
+        >>> dynamodb_client().get_item(TableName="configuration_table", Key=key)
+
+    Returns
+    -------
+    DynamoDB.Client
+        boto3 DynamoDB low-level client
+    """
+    global _client
+    if _client is None:
+        logger.debug("Creating DynamoDB client")
+        _client = boto3.client(
+            "dynamodb", config=Config(retries={"max_attempts": 2}, tcp_keepalive=True)
+        )
+
+    return _client
+
+
+def load_configs(keys: List[Tuple[str, str]], use_cache: bool = True) -> Dict[Tuple[str, str], Any]:
+    """Fetches configuration values for many (configID, attribute) pairs at once
+
+    Values fetched within the last CONFIG_CACHE_TTL seconds are served from memory;
+    the remaining ones are fetched from the configuration table in a single BatchGetItem call,
+    retrying UnprocessedKeys with exponential backoff up to CONFIG_BATCH_MAX_ATTEMPTS calls
+
+    Example
+    -------
+    Fetch anomaly and cancel settings for a function
+
+        >>> from lambda_python_powertools.config import load_configs
+        >>> configs = load_configs([("anomaly_mode", "Activate"), ("cancel_mode", "Prob")])
+        >>> cancel_prob = float(configs[("cancel_mode", "Prob")])
+
+    Parameters
+    ----------
+    keys : List[Tuple[str, str]]
+        (configID, attribute) pairs to be fetched
+    use_cache : bool, optional
+        Serve fresh values from memory, by default True
+
+    Returns
+    -------
+    Dict[Tuple[str, str], Any]
+        Deserialized configuration value for each (configID, attribute) pair
+
+    Raises
+    ------
+    RuntimeError
+        When keys are still unprocessed after CONFIG_BATCH_MAX_ATTEMPTS calls
+    """
+    now = time.monotonic()
+    configs = {}
+    missing = []
+    for key in keys:
+        cached = _config_cache.get(key)
+        if use_cache and cached and now - cached[0] < CONFIG_CACHE_TTL:
+            configs[key] = cached[1]
+        else:
+            missing.append(key)
+
+    if not missing:
+        return configs
+
+    logger.debug(f"Fetching configuration values for {missing}")
+    config_ids = list(dict.fromkeys(config_id for config_id, _ in missing))
+    attributes = list(dict.fromkeys(attribute for _, attribute in missing))
+    request = {
+        CONFIG_TABLE_NAME: {
+            "Keys": [{"configID": {"S": config_id}} for config_id in config_ids],
+            "ProjectionExpression": ", ".join(["configID", *attributes]),
+        }
+    }
+
+    items = {}
+    for attempt in range(CONFIG_BATCH_MAX_ATTEMPTS):
+        if attempt:
+            time.sleep(CONFIG_BATCH_BACKOFF * 2 ** attempt)
+        ret = dynamodb_client().batch_get_item(RequestItems=request)
+        for item in ret["Responses"].get(CONFIG_TABLE_NAME, []):
+            items[item["configID"]["S"]] = item
+        request = ret.get("UnprocessedKeys")
+        if not request:
+            break
+    else:
+        raise RuntimeError(
+            f"Configuration keys unprocessed after {CONFIG_BATCH_MAX_ATTEMPTS} attempts: {request}"
+        )
+
+    for config_id, attribute in missing:
+        value = _deserializer.deserialize(items[config_id][attribute])
+        _config_cache[(config_id, attribute)] = (now, value)
+        configs[(config_id, attribute)] = value
+
+    return configs
+
+
+def get_config(config_id: str, attribute: str, use_cache: bool = True) -> Any:
+    """Fetches a single configuration value
+
+    Prefer load_configs when more than one value is needed, as it fetches them all in one call
+
+    Parameters
+    ----------
+    config_id : str
+        configID of the configuration item
+    attribute : str
+        Attribute name to be read from the configuration item
+    use_cache : bool, optional
+        Serve a fresh value from memory, by default True
+
+    Returns
+    -------
+    Any
+        Deserialized configuration value
+    """
+    return load_configs([(config_id, attribute)], use_cache=use_cache)[(config_id, attribute)]
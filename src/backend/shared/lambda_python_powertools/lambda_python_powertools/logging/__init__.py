@@ -2,7 +2,10 @@
 """
 from ..helper.models import MetricUnit
 from .logger import (
+    add_metric,
+    flush_metrics,
     log_metric,
+    logger_flush_metrics,
     logger_inject_lambda_context,
     logger_inject_process_booking_sfn,
     logger_setup,
@@ -13,5 +16,8 @@ __all__ = [
     "logger_inject_lambda_context",
     "logger_inject_process_booking_sfn",
     "log_metric",
+    "add_metric",
+    "flush_metrics",
+    "logger_flush_metrics",
     "MetricUnit",
 ]
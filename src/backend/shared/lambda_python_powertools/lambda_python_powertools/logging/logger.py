@@ -1,10 +1,12 @@
 import functools
 import itertools
+import json
 import logging
 import os
 import setuptools
+import time
 from distutils.util import strtobool
-from typing import Any, Callable, Dict
+from typing import Any, Callable, Dict, List
 
 import aws_lambda_logging
 
@@ -20,6 +22,9 @@ logger.setLevel(os.getenv("LOG_LEVEL", "INFO"))
 
 is_cold_start = True
 
+# Metrics added during the current invocation, emitted together by flush_metrics
+_metrics_buffer: List[Dict] = []
+
 
 def logger_setup(service: str = "service_undefined", level: str = "INFO", **kwargs):
     """Setups root logger to format statements in JSON.
@@ -188,6 +193,37 @@ def logger_inject_process_booking_sfn(lambda_handler: Callable[[Dict, Any], Any]
     return decorate
 
 
+def logger_flush_metrics(lambda_handler: Callable[[Dict, Any], Any] = None):
+    """Decorator to emit all metrics added during an invocation as a single EMF record
+
+    Metrics are flushed once the handler returns or raises
+
+    Example
+    -------
+    Emits ColdStart and SuccessfulPayments metrics in one log record
+        >>> from lambda_python_powertools.logging import MetricUnit, add_metric, logger_flush_metrics
+        >>>
+        >>> @logger_flush_metrics
+        >>> def handler(event, context):
+                add_metric(name="ColdStart", unit=MetricUnit.Count, value=1)
+                add_metric(name="SuccessfulPayments", unit=MetricUnit.Count, value=1)
+
+    Returns
+    -------
+    decorate : Callable
+        Decorated lambda handler
+    """
+
+    @functools.wraps(lambda_handler)
+    def decorate(event, context):
+        try:
+            return lambda_handler(event, context)
+        finally:
+            flush_metrics()
+
+    return decorate
+
+
 def __is_cold_start() -> str:
     """Verifies whether is cold start and return a string used for struct logging
 
@@ -299,16 +335,145 @@ def __build_dimensions(**dimensions) -> str:
     str
         Dimensions in the form of "key=value,key2=value2"
     """
-    dimension = ""
+    dimensions_list = [
+        dimension + "=" + value for dimension, value in __filter_dimensions(**dimensions).items()
+    ]
+
+    return ",".join(dimensions_list)
+
+
+def __filter_dimensions(**dimensions) -> Dict[str, str]:
+    """Takes up to 9 non-empty dimensions from kwargs
 
+    Returns
+    -------
+    Dict[str, str]
+        Dimensions to be added alongside service name
+    """
     # CloudWatch accepts a max of 10 dimensions per metric
     # We include service name as a dimension
     # so we take up to 9 values as additional dimensions
-    # before we convert everything to a string of key=value
     dimensions_partition = dict(itertools.islice(dimensions.items(), 9))
-    dimensions_list = [
-        dimension + "=" + value for dimension, value in dimensions_partition.items() if value
-    ]
-    dimension = ",".join(dimensions_list)
 
-    return dimension
+    return {dimension: value for dimension, value in dimensions_partition.items() if value}
+
+
+def add_metric(name: str, unit: MetricUnit, value: float = 0, **dimensions):
+    """Adds a custom metric to be emitted by the next flush_metrics call
+
+    Unlike log_metric, nothing is written to stdout until flush_metrics is called,
+    so that all metrics of an invocation end up in a single log record
+
+    Example
+    -------
+    Add metric to count number of successful payments per customer
+
+        >>> from lambda_python_powertools.logging import MetricUnit, add_metric
+        >>> add_metric(name="SuccessfulPayments", unit=MetricUnit.Count, value=1, customer=customer_id)
+
+    Parameters
+    ----------
+    name : str
+        metric name
+    unit : MetricUnit
+        metric unit enum value (e.g. MetricUnit.Seconds)
+    value : float, optional
+        metric value, by default 0
+    dimensions: dict, optional
+        keyword arguments as additional dimensions (e.g. customer=customerId)
+    """
+    logger.debug(
+        f"Adding custom metric. Name: {name}, Unit: {unit}, Value: {value}, Dimensions: {dimensions}"
+    )
+    unit = build_metric_unit_from_str(unit)
+
+    _metrics_buffer.append(
+        {
+            "name": name,
+            # EMF expects CloudWatch unit names, e.g. BytesPerSecond as Bytes/Second
+            "unit": unit.name.replace("PerSecond", "/Second"),
+            "value": value,
+            "dimensions": __filter_dimensions(**dimensions),
+        }
+    )
+
+
+def flush_metrics(service: str = "service_undefined", namespace: str = "ServerlessAirline"):
+    """Logs all metrics added since the last flush in CloudWatch Embedded Metric Format (EMF)
+
+    CloudWatch Logs extracts EMF records into custom metrics natively,
+    so metrics are created without a log subscription or an extra API call.
+    Metrics sharing the same dimension names are grouped under one directive;
+    a metric whose dimension values clash with an earlier one goes into a further record
+
+    Output: {"_aws": {"Timestamp": ..., "CloudWatchMetrics": [...]}, "service": ..., <metric_name>: <metric_value>}
+
+    Environment variables
+    ---------------------
+    POWERTOOLS_SERVICE_NAME : str
+        service name
+
+    Parameters
+    ----------
+    service : str, optional
+        service name used as dimension, by default "service_undefined"
+    namespace : str, optional
+        metric namespace (e.g. application name), by default "ServerlessAirline"
+    """
+    if not _metrics_buffer:
+        return
+
+    service = os.getenv("POWERTOOLS_SERVICE_NAME") or service
+    timestamp = int(time.time() * 1000)
+
+    for record in __build_emf_records(service=service):
+        directives = {}
+        for name, (dimension_names, unit) in record["metrics"].items():
+            directives.setdefault(dimension_names, []).append({"Name": name, "Unit": unit})
+
+        emf = {
+            "_aws": {
+                "Timestamp": timestamp,
+                "CloudWatchMetrics": [
+                    {"Namespace": namespace, "Dimensions": [list(names)], "Metrics": metrics}
+                    for names, metrics in directives.items()
+                ],
+            },
+            **record["dimensions"],
+        }
+        for name, values in record["values"].items():
+            emf[name] = values[0] if len(values) == 1 else values
+
+        print(json.dumps(emf))
+
+    _metrics_buffer.clear()
+
+
+def __build_emf_records(service: str) -> List[Dict]:
+    """Groups buffered metrics into as few EMF records as their dimension values allow
+
+    Returns
+    -------
+    List[Dict]
+        records with dimension values, metric definitions and metric values
+    """
+    records = []
+    for metric in _metrics_buffer:
+        name = metric["name"]
+        dimensions = {"service": service, **metric["dimensions"]}
+        dimension_names = tuple(dimensions)
+
+        for record in records:
+            same_definition = record["metrics"].get(name, (dimension_names,))[0] == dimension_names
+            same_values = all(record["dimensions"].get(k, v) == v for k, v in dimensions.items())
+            if same_definition and same_values:
+                break
+        else:
+            record = {"dimensions": {}, "metrics": {}, "values": {}}
+            records.append(record)
+
+        record["dimensions"].update(dimensions)
+        record["metrics"][name] = (dimension_names, metric["unit"])
+        record["values"].setdefault(name, []).append(metric["value"])
+
+    return records
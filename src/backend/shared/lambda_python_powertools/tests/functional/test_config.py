@@ -0,0 +1,210 @@
+import pytest
+from botocore.stub import Stubber
+
+from lambda_python_powertools.config import (
+    CANCEL_OUTCOME,
+    anomaly,
+    dynamodb_client,
+    get_config,
+    load_configs,
+    loader,
+    sample_anomaly,
+    sample_outcome,
+)
+
+
+@pytest.fixture
+def stubber(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    monkeypatch.setattr(loader, "_client", None)
+    monkeypatch.setattr(loader, "_config_cache", {})
+
+    with Stubber(dynamodb_client()) as stub:
+        yield stub
+        stub.assert_no_pending_responses()
+
+
+def batch_get_item(config_ids, attributes, items, unprocessed_keys=None):
+    request = {
+        "configuration_table": {
+            "Keys": [{"configID": {"S": config_id}} for config_id in config_ids],
+            "ProjectionExpression": ", ".join(["configID", *attributes]),
+        }
+    }
+    response = {"Responses": {"configuration_table": items}}
+    if unprocessed_keys:
+        response["UnprocessedKeys"] = unprocessed_keys
+
+    return response, {"RequestItems": request}
+
+
+def test_load_configs_single_batch(stubber):
+    # GIVEN several attributes spread across configuration items
+    # WHEN load_configs is called
+    # THEN all values should be fetched in a single BatchGetItem and deserialized
+    items = [
+        {"configID": {"S": "anomaly_mode"}, "Activate": {"BOOL": True}},
+        {"configID": {"S": "cancel_mode"}, "Activate": {"BOOL": False}, "Prob": {"N": "0.25"}},
+    ]
+    stubber.add_response(
+        "batch_get_item",
+        *batch_get_item(["anomaly_mode", "cancel_mode"], ["Activate", "Prob"], items),
+    )
+
+    configs = load_configs(
+        [("anomaly_mode", "Activate"), ("cancel_mode", "Activate"), ("cancel_mode", "Prob")]
+    )
+
+    assert configs[("anomaly_mode", "Activate")] is True
+    assert configs[("cancel_mode", "Activate")] is False
+    assert float(configs[("cancel_mode", "Prob")]) == 0.25
+
+
+def test_load_configs_cached(stubber):
+    # GIVEN a configuration value has already been fetched
+    # WHEN it is requested again within the cache TTL
+    # THEN no further DynamoDB call should be made
+    items = [{"configID": {"S": "anomaly_mode"}, "Activate": {"BOOL": True}}]
+    stubber.add_response("batch_get_item", *batch_get_item(["anomaly_mode"], ["Activate"], items))
+
+    assert get_config("anomaly_mode", "Activate") is True
+    assert get_config("anomaly_mode", "Activate") is True
+
+
+def test_load_configs_bypass_cache(stubber):
+    # GIVEN a configuration value has already been fetched
+    # WHEN it is requested again with use_cache=False
+    # THEN DynamoDB should be queried again
+    items = [{"configID": {"S": "anomaly_mode"}, "Activate": {"BOOL": True}}]
+    stubber.add_response("batch_get_item", *batch_get_item(["anomaly_mode"], ["Activate"], items))
+    stubber.add_response("batch_get_item", *batch_get_item(["anomaly_mode"], ["Activate"], items))
+
+    get_config("anomaly_mode", "Activate")
+    get_config("anomaly_mode", "Activate", use_cache=False)
+
+
+def test_load_configs_unprocessed_keys(stubber, mocker):
+    # GIVEN DynamoDB returns some keys as unprocessed
+    # WHEN load_configs is called
+    # THEN unprocessed keys should be requested again after a backoff
+    sleep = mocker.patch.object(loader.time, "sleep")
+    unprocessed = {
+        "configuration_table": {
+            "Keys": [{"configID": {"S": "cancel_mode"}}],
+            "ProjectionExpression": "configID, Activate",
+        }
+    }
+    stubber.add_response(
+        "batch_get_item",
+        *batch_get_item(
+            ["anomaly_mode", "cancel_mode"],
+            ["Activate"],
+            [{"configID": {"S": "anomaly_mode"}, "Activate": {"BOOL": True}}],
+            unprocessed_keys=unprocessed,
+        ),
+    )
+    stubber.add_response(
+        "batch_get_item",
+        {
+            "Responses": {
+                "configuration_table": [
+                    {"configID": {"S": "cancel_mode"}, "Activate": {"BOOL": False}}
+                ]
+            }
+        },
+        {"RequestItems": unprocessed},
+    )
+
+    configs = load_configs([("anomaly_mode", "Activate"), ("cancel_mode", "Activate")])
+
+    assert configs == {("anomaly_mode", "Activate"): True, ("cancel_mode", "Activate"): False}
+    sleep.assert_called_once_with(loader.CONFIG_BATCH_BACKOFF * 2)
+
+
+def test_load_configs_unprocessed_keys_exhausted(stubber, mocker):
+    # GIVEN DynamoDB keeps returning keys as unprocessed
+    # WHEN load_configs has used up its attempts
+    # THEN it should stop retrying and raise
+    mocker.patch.object(loader.time, "sleep")
+    unprocessed = {
+        "configuration_table": {
+            "Keys": [{"configID": {"S": "anomaly_mode"}}],
+            "ProjectionExpression": "configID, Activate",
+        }
+    }
+    for _ in range(loader.CONFIG_BATCH_MAX_ATTEMPTS):
+        stubber.add_response(
+            "batch_get_item",
+            {"Responses": {"configuration_table": []}, "UnprocessedKeys": unprocessed},
+            {"RequestItems": unprocessed},
+        )
+
+    with pytest.raises(RuntimeError):
+        load_configs([("anomaly_mode", "Activate")])
+
+
+@pytest.mark.parametrize(
+    "draw,expected", [(0.05, "first"), (0.15, "second"), (0.25, "cancel"), (0.9, None)]
+)
+def test_sample_outcome(mocker, draw, expected):
+    # GIVEN outcomes occupying consecutive slices of [0, 1)
+    # WHEN the random draw falls into one of them
+    # THEN that outcome should be returned, or None outside every slice
+    mocker.patch("random.random", return_value=draw)
+
+    outcome = sample_outcome([("first", 0.1), ("second", 0.1), ("cancel", 0.1)])
+
+    assert outcome == expected
+
+
+ANOMALY_ITEMS = [
+    {"configID": {"S": "anomaly_mode"}, "Activate": {"BOOL": True}},
+    {"configID": {"S": "Airline-Test-master"}, "anomaly_prob": {"N": "0.1"}},
+    {"configID": {"S": "cancel_mode"}, "Activate": {"BOOL": True}, "Prob": {"N": "0.1"}},
+]
+
+
+def test_sample_anomaly_disabled(stubber, monkeypatch):
+    # GIVEN anomaly injection is not enabled for the deployment
+    # WHEN sample_anomaly is called
+    # THEN no configuration should be read and no anomaly drawn
+    monkeypatch.setattr(anomaly, "ANOMALY_ENABLED", False)
+
+    assert sample_anomaly([("DataLeakage", "Airline-Test-master")]) is None
+
+
+@pytest.mark.parametrize("draw,expected", [(0.05, "DataLeakage"), (0.5, None)])
+def test_sample_anomaly(stubber, monkeypatch, mocker, draw, expected):
+    # GIVEN anomaly injection is enabled and anomaly_mode is active
+    # WHEN the random draw falls into the anomaly's slice, or outside every slice
+    # THEN that anomaly should be returned, or None
+    monkeypatch.setattr(anomaly, "ANOMALY_ENABLED", True)
+    mocker.patch("random.random", return_value=draw)
+    stubber.add_response(
+        "batch_get_item",
+        *batch_get_item(
+            ["anomaly_mode", "Airline-Test-master", "cancel_mode"],
+            ["Activate", "anomaly_prob", "Prob"],
+            ANOMALY_ITEMS,
+        ),
+    )
+
+    assert sample_anomaly([("DataLeakage", "Airline-Test-master")]) == expected
+
+
+def test_sample_anomaly_cancel(stubber, monkeypatch, mocker):
+    # GIVEN anomaly injection is enabled and cancel_mode is active
+    # WHEN the random draw falls into the cancel slice
+    # THEN the cancel outcome should be returned for the handler to act on
+    monkeypatch.setattr(anomaly, "ANOMALY_ENABLED", True)
+    mocker.patch("random.random", return_value=0.15)
+    stubber.add_response(
+        "batch_get_item",
+        *batch_get_item(
+            ["anomaly_mode", "Airline-Test-master", "cancel_mode"],
+            ["Activate", "anomaly_prob", "Prob"],
+            ANOMALY_ITEMS,
+        ),
+    )
+
+    assert sample_anomaly([("DataLeakage", "Airline-Test-master")]) == CANCEL_OUTCOME
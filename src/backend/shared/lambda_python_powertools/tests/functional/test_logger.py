@@ -7,7 +7,10 @@ import pytest
 
 from lambda_python_powertools.logging import (
     MetricUnit,
+    add_metric,
+    flush_metrics,
     log_metric,
+    logger_flush_metrics,
     logger_inject_lambda_context,
     logger_inject_process_booking_sfn,
     logger_setup,
@@ -378,3 +381,90 @@ def test_log_metric_invalid_unit(invalid_input, expected):
 
     with pytest.raises(expected):
         log_metric(name="test_metric", **invalid_input)
+
+
+def test_flush_metrics_single_emf_record(capsys):
+    # GIVEN metrics with different dimensions are added during an invocation
+    # WHEN handler decorated with logger_flush_metrics returns
+    # THEN a single EMF record should be logged with one directive per dimension set
+    @logger_flush_metrics
+    def handler(event, context):
+        add_metric(name="ColdStart", unit=MetricUnit.Count, value=1, function_name="booking")
+        add_metric(name="SuccessfulBooking", unit=MetricUnit.Count, value=1)
+
+    handler({}, {})
+    captured = capsys.readouterr()
+    emf = json.loads(captured.out)
+
+    assert captured.out.count("\n") == 1
+    assert emf["_aws"]["CloudWatchMetrics"] == [
+        {
+            "Namespace": "ServerlessAirline",
+            "Dimensions": [["service", "function_name"]],
+            "Metrics": [{"Name": "ColdStart", "Unit": "Count"}],
+        },
+        {
+            "Namespace": "ServerlessAirline",
+            "Dimensions": [["service"]],
+            "Metrics": [{"Name": "SuccessfulBooking", "Unit": "Count"}],
+        },
+    ]
+    assert emf["service"] == "service_undefined"
+    assert emf["function_name"] == "booking"
+    assert emf["ColdStart"] == 1
+    assert emf["SuccessfulBooking"] == 1
+
+
+def test_flush_metrics_on_exception(capsys):
+    # GIVEN a metric is added before the handler raises
+    # WHEN handler decorated with logger_flush_metrics is called
+    # THEN the metric should still be logged and the exception propagated
+    @logger_flush_metrics
+    def handler(event, context):
+        add_metric(name="FailedBooking", unit=MetricUnit.Count, value=1)
+        raise ValueError("Invalid booking request")
+
+    with pytest.raises(ValueError):
+        handler({}, {})
+
+    emf = json.loads(capsys.readouterr().out)
+    assert emf["FailedBooking"] == 1
+
+
+def test_flush_metrics_clashing_dimension_values(capsys):
+    # GIVEN the same metric is added with different dimension values
+    # WHEN flush_metrics is called
+    # THEN each dimension value should be logged in its own EMF record
+    add_metric(name="InvalidBookingRequest", unit=MetricUnit.Count, value=1, operation="reserve")
+    add_metric(name="InvalidBookingRequest", unit=MetricUnit.Count, value=1, operation="confirm")
+    flush_metrics(service="booking")
+
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+
+    assert [record["operation"] for record in records] == ["reserve", "confirm"]
+    assert all(record["service"] == "booking" for record in records)
+
+
+def test_flush_metrics_repeated_metric_and_unit(capsys):
+    # GIVEN the same metric is added twice with a per second unit
+    # WHEN flush_metrics is called
+    # THEN values should be logged as a list and unit in CloudWatch format
+    add_metric(name="Throughput", unit=MetricUnit.BytesPerSecond, value=2)
+    add_metric(name="Throughput", unit=MetricUnit.BytesPerSecond, value=3)
+    flush_metrics()
+
+    emf = json.loads(capsys.readouterr().out)
+
+    assert emf["_aws"]["CloudWatchMetrics"][0]["Metrics"] == [
+        {"Name": "Throughput", "Unit": "Bytes/Second"}
+    ]
+    assert emf["Throughput"] == [2, 3]
+
+
+def test_flush_metrics_empty_buffer(capsys):
+    # GIVEN no metrics were added
+    # WHEN flush_metrics is called
+    # THEN nothing should be logged
+    flush_metrics()
+
+    assert capsys.readouterr().out == ""